@@ -1,8 +1,9 @@
 import os
 import csv
+import sqlite3
 import pandas as pd
 import numpy as np
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone, timedelta
 from PyQt5.QtWidgets import (QAction, QFileDialog, QMessageBox, QWidget, QVBoxLayout,
                              QLabel, QPushButton, QListWidget, QDateEdit, QHBoxLayout,
                              QCheckBox, QComboBox, QProgressBar, QTabWidget, QTextBrowser)
@@ -16,19 +17,664 @@ import mplcursors
 from scipy.stats import linregress
 import pymannkendall as mk
 from qgis.core import (QgsVectorLayer, QgsField, QgsFeature, QgsGeometry, QgsRectangle,
-                       QgsPointXY, QgsProject, QgsMarkerSymbol, QgsCoordinateReferenceSystem, QgsVectorFileWriter)
+                       QgsPointXY, QgsProject, QgsMarkerSymbol, QgsCoordinateReferenceSystem, QgsVectorFileWriter,
+                       QgsDateTimeRange, QgsInterval, QgsUnitTypes, QgsProperty, QgsSymbolLayer,
+                       QgsVectorLayerTemporalProperties, QgsTemporalNavigationObject)
 from qgis.PyQt.QtCore import QVariant
 # Kodun başına ekledik hata uyarıları konsolda gizlemek için
 import warnings
 warnings.filterwarnings("ignore")
 
 
+class FlowTimeSeriesStore:
+    """SQLite/GeoPackage backed (station, date, flow) time-series table"""
+
+    TABLE = "flow_series"
+    STATIONS_TABLE = "flow_stations"
+    SKETCHES_TABLE = "flow_sketches"
+    SKETCH_ACCURACY = 0.01
+
+    # SQL tarafında hesaplanabilen basit toplulaştırmalar
+    AGGREGATES = {"count": "COUNT", "mean": "AVG", "min": "MIN", "max": "MAX", "sum": "SUM"}
+    PERIODS = {"year": ("Year", "%Y"), "month": ("Month", "%m")}
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+
+    def connect(self):
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.conn = sqlite3.connect(self.path)
+            self.create_schema()
+            self.backfill_sketches()
+        return self.conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def create_schema(self):
+        """Create tables and the composite (station, date) index if missing"""
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                station TEXT NOT NULL,
+                date TEXT NOT NULL,
+                flow REAL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_{self.TABLE}_station_date
+                ON {self.TABLE} (station, date);
+            CREATE TABLE IF NOT EXISTS {self.STATIONS_TABLE} (
+                station TEXT PRIMARY KEY,
+                latitude REAL,
+                longitude REAL
+            );
+            CREATE TABLE IF NOT EXISTS {self.SKETCHES_TABLE} (
+                station TEXT NOT NULL,
+                month INTEGER NOT NULL,
+                zero_count INTEGER,
+                bin_offset INTEGER,
+                bins BLOB,
+                PRIMARY KEY (station, month)
+            );
+        """)
+        self.conn.commit()
+
+    def append(self, df):
+        """Insert (or replace) rows of a loaded CSV DataFrame"""
+        conn = self.connect()
+        rows = zip(df["Station"].astype(str),
+                   df["Date"].dt.strftime("%Y-%m-%d"),
+                   df["Flow"].astype(float))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {self.TABLE} (station, date, flow) VALUES (?, ?, ?)", rows)
+
+        stations = df.groupby("Station")[["Latitude", "Longitude"]].first()
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {self.STATIONS_TABLE} (station, latitude, longitude) VALUES (?, ?, ?)",
+            [(str(s), float(r["Latitude"]), float(r["Longitude"])) for s, r in stations.iterrows()])
+
+        self.update_sketches(df["Station"].astype(str).unique(), df["Date"].min(), df["Date"].max())
+        conn.commit()
+
+    def update_sketches(self, stations, start_date, end_date):
+        """Rebuild the monthly quantile sketches of the stations for months touching the range
+
+        Sketches are rebuilt from the stored rows of those months only, so
+        replaced rows never get counted twice.
+        """
+        first = FlowQuantileIndex.month_index(start_date)
+        last = FlowQuantileIndex.month_index(end_date)
+        month_start = date(first // 12, first % 12 + 1, 1)
+        month_end = (date(last // 12, last % 12 + 1, 28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+        rows = self.query(stations, month_start, month_end)
+
+        months = rows["Date"].dt.year * 12 + rows["Date"].dt.month - 1
+        records = []
+        for (station, month), flows in rows["Flow"].groupby([rows["Station"], months]):
+            sketch = FlowQuantileSketch(self.SKETCH_ACCURACY).add(flows.to_numpy())
+            records.append((station, int(month)) + sketch.to_record())
+        conn = self.connect()
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {self.SKETCHES_TABLE} (station, month, zero_count, bin_offset, bins) "
+            f"VALUES (?, ?, ?, ?, ?)", records)
+        conn.commit()
+
+    def backfill_sketches(self):
+        """Build sketches once for a store created before the sketch table existed"""
+        conn = self.conn
+        if conn.execute(f"SELECT 1 FROM {self.SKETCHES_TABLE} LIMIT 1").fetchone():
+            return
+        start, end = conn.execute(f"SELECT MIN(date), MAX(date) FROM {self.TABLE}").fetchone()
+        if start is None:
+            return
+        stations = [row[0] for row in conn.execute(f"SELECT DISTINCT station FROM {self.TABLE}")]
+        self.update_sketches(stations, pd.Timestamp(start), pd.Timestamp(end))
+
+    def merged_sketches(self, stations, first, last):
+        """Merge each station's stored sketches of months first..last"""
+        sketches = {station: FlowQuantileSketch(self.SKETCH_ACCURACY) for station in stations}
+        if first > last:
+            return sketches
+        self._select_stations(stations)
+        conn = self.connect()
+        cur = conn.execute(
+            f"SELECT station, zero_count, bin_offset, bins FROM {self.SKETCHES_TABLE} "
+            f"WHERE station IN (SELECT station FROM temp.selected_stations) AND month BETWEEN ? AND ?",
+            (first, last))
+        for station, zero_count, offset, bins in cur:
+            sketches[station].merge(FlowQuantileSketch.from_record(zero_count, offset, bins, self.SKETCH_ACCURACY))
+        conn.commit()
+        return sketches
+
+    def locations(self):
+        """Return stored station coordinates as {station: {'Latitude', 'Longitude'}}"""
+        cur = self.connect().execute(
+            f"SELECT station, latitude, longitude FROM {self.STATIONS_TABLE} ORDER BY station")
+        return {s: {'Latitude': lat, 'Longitude': lon} for s, lat, lon in cur}
+
+    def _select_stations(self, stations):
+        """Write the station selection to a temp table (avoids the SQL variable limit)"""
+        conn = self.connect()
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected_stations (station TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM temp.selected_stations")
+        conn.executemany("INSERT OR IGNORE INTO temp.selected_stations (station) VALUES (?)",
+                         ((str(s),) for s in stations))
+        # Örtük işlem kapatılır; aksi halde veritabanı kilitli kalır
+        conn.commit()
+
+    def _where(self, stations, start_date, end_date, prefix=""):
+        self._select_stations(stations)
+        clause = (f"{prefix}station IN (SELECT station FROM temp.selected_stations) "
+                  f"AND {prefix}date BETWEEN ? AND ?")
+        params = [start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")]
+        return clause, params
+
+    def query(self, stations, start_date, end_date):
+        """Return raw rows for the selected stations and date range"""
+        clause, params = self._where(stations, start_date, end_date, prefix="s.")
+        conn = self.connect()
+        df = pd.read_sql_query(
+            f"SELECT s.station AS Station, s.date AS Date, s.flow AS Flow, "
+            f"m.latitude AS Latitude, m.longitude AS Longitude "
+            f"FROM {self.TABLE} s LEFT JOIN {self.STATIONS_TABLE} m ON m.station = s.station "
+            f"WHERE {clause} ORDER BY s.station, s.date",
+            conn, params=params)
+        conn.commit()
+        df["Date"] = pd.to_datetime(df["Date"], format="%Y-%m-%d")
+        return df
+
+    def aggregate(self, stations, start_date, end_date, func, period=None):
+        """Compute count/mean/min/max/sum of Flow per station (and per year/month) in SQL"""
+        sql_func = self.AGGREGATES[func]
+        clause, params = self._where(stations, start_date, end_date)
+        group_cols = "station"
+        select_cols = "station AS Station"
+        if period is not None:
+            column, fmt = self.PERIODS[period]
+            select_cols += f", CAST(strftime('{fmt}', date) AS INTEGER) AS {column}"
+            group_cols += f", {column}"
+        conn = self.connect()
+        df = pd.read_sql_query(
+            f"SELECT {select_cols}, {sql_func}(flow) AS Flow FROM {self.TABLE} "
+            f"WHERE {clause} GROUP BY {group_cols} ORDER BY {group_cols}",
+            conn, params=params)
+        conn.commit()
+        return df
+
+    def add_to_project(self, stations_layer_name):
+        """Add the flow table to QGIS and relate it to the station point layer"""
+        from qgis.core import QgsRelation
+
+        project = QgsProject.instance()
+        layer_name = "Akım Zaman Serisi"
+        existing = project.mapLayersByName(layer_name)
+        flow_layer = existing[0] if existing else QgsVectorLayer(
+            f"{self.path}|layername={self.TABLE}", layer_name, "ogr")
+        if not flow_layer.isValid():
+            return None
+        if not existing:
+            project.addMapLayer(flow_layer)
+
+        station_layers = project.mapLayersByName(stations_layer_name)
+        if station_layers:
+            station_layer = station_layers[0]
+            key_field = next((f for f in ("Station", "station", "İstasyon")
+                              if station_layer.fields().indexOf(f) >= 0), None)
+            if key_field and not project.relationManager().relation("station_flow_series").isValid():
+                relation = QgsRelation()
+                relation.setId("station_flow_series")
+                relation.setName("İstasyon Akımları")
+                relation.setReferencedLayer(station_layer.id())
+                relation.setReferencingLayer(flow_layer.id())
+                relation.addFieldPair("station", key_field)
+                if relation.isValid():
+                    project.relationManager().addRelation(relation)
+        return flow_layer
+
+
+class StationRegistry:
+    """Station metadata kept in contiguous arrays addressed by small integer ids
+
+    Flow rows only carry a StationId; coordinates and record coverage are
+    looked up with vectorized takes on these arrays.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.index = {}  # station code -> id
+        self.codes = np.empty(0, dtype=object)
+        self.latitudes = np.empty(0, dtype=float)
+        self.longitudes = np.empty(0, dtype=float)
+        self.record_counts = np.empty(0, dtype=np.int64)
+        self.first_dates = np.empty(0, dtype="datetime64[ns]")
+        self.last_dates = np.empty(0, dtype="datetime64[ns]")
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.index
+
+    def add_many(self, codes, latitudes, longitudes):
+        """Return the ids of stations, registering new ones with a single array extension"""
+        ids = np.empty(len(codes), dtype=np.int32)
+        new_rows = []
+        for i, code in enumerate(codes):
+            station_id = self.index.get(code)
+            if station_id is None:
+                station_id = len(self.codes) + len(new_rows)
+                self.index[code] = station_id
+                new_rows.append(i)
+            ids[i] = station_id
+
+        if new_rows:
+            count = len(new_rows)
+            new_codes = np.empty(count, dtype=object)
+            new_codes[:] = [codes[i] for i in new_rows]
+            self.codes = np.concatenate([self.codes, new_codes])
+            self.latitudes = np.concatenate([self.latitudes, np.asarray(latitudes, dtype=float)[new_rows]])
+            self.longitudes = np.concatenate([self.longitudes, np.asarray(longitudes, dtype=float)[new_rows]])
+            self.record_counts = np.concatenate([self.record_counts, np.zeros(count, dtype=np.int64)])
+            self.first_dates = np.concatenate([self.first_dates, np.full(count, np.datetime64("NaT", "ns"))])
+            self.last_dates = np.concatenate([self.last_dates, np.full(count, np.datetime64("NaT", "ns"))])
+        return ids
+
+    def add(self, code, latitude, longitude):
+        """Return the id of a station, registering it if it is new"""
+        return int(self.add_many([code], [latitude], [longitude])[0])
+
+    def register(self, df):
+        """Register the stations of a loaded DataFrame and return its per-row StationId array
+
+        Rows without a Station get id -1.
+        """
+        local_codes, uniques = pd.factorize(df["Station"])
+        row_ids = np.full(len(df), -1, dtype=np.int32)
+        valid = local_codes >= 0
+        if not valid.any():
+            return row_ids
+        local_codes = local_codes[valid]
+        groups = df[valid].groupby(local_codes)
+        first = groups[["Latitude", "Longitude"]].first()
+        ids = self.add_many(list(uniques), first["Latitude"].to_numpy(), first["Longitude"].to_numpy())
+
+        # Kayıt kapsamı: veri sayısı ve ilk/son tarih
+        np.add.at(self.record_counts, ids, np.bincount(local_codes, minlength=len(uniques)))
+        first_dates = groups["Date"].min().to_numpy(dtype="datetime64[ns]")
+        last_dates = groups["Date"].max().to_numpy(dtype="datetime64[ns]")
+        old_first, old_last = self.first_dates[ids], self.last_dates[ids]
+        self.first_dates[ids] = np.where(np.isnat(old_first) | (first_dates < old_first), first_dates, old_first)
+        self.last_dates[ids] = np.where(np.isnat(old_last) | (last_dates > old_last), last_dates, old_last)
+
+        row_ids[valid] = ids[local_codes]
+        return row_ids
+
+    def ids_for(self, codes):
+        """Map station codes to ids (-1 for unknown stations)"""
+        return np.fromiter((self.index.get(code, -1) for code in codes), dtype=np.int32, count=len(codes))
+
+    def coordinates(self, ids):
+        """Return (latitudes, longitudes) for an id array, NaN where the id is -1"""
+        ids = np.asarray(ids)
+        valid = ids >= 0
+        latitudes = np.full(len(ids), np.nan)
+        longitudes = np.full(len(ids), np.nan)
+        latitudes[valid] = self.latitudes[ids[valid]]
+        longitudes[valid] = self.longitudes[ids[valid]]
+        return latitudes, longitudes
+
+    def expand(self, df):
+        """Turn StationId-keyed flow rows back into Station/Date/Flow/Latitude/Longitude"""
+        ids = df["StationId"].to_numpy()
+        return pd.DataFrame({
+            "Station": self.codes[ids],
+            "Date": df["Date"].to_numpy(),
+            "Flow": df["Flow"].to_numpy(),
+            "Latitude": self.latitudes[ids],
+            "Longitude": self.longitudes[ids]
+        }, index=df.index)
+
+
+class FlowQuantileSketch:
+    """Mergeable relative-error quantile sketch over log-spaced buckets (DDSketch)
+
+    Buckets are a contiguous count array starting at ``offset``, so merging
+    two sketches is an element-wise sum. Non-positive flows share a single
+    zero bucket.
+    """
+
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        self.zero_count = 0
+        self.offset = 0
+        self.bins = np.zeros(0, dtype=np.int64)
+
+    @property
+    def count(self):
+        return self.zero_count + int(self.bins.sum())
+
+    def to_record(self):
+        """Return (zero_count, offset, bins bytes) for storing in SQLite"""
+        return self.zero_count, self.offset, self.bins.astype("<i8").tobytes()
+
+    @classmethod
+    def from_record(cls, zero_count, offset, bins, relative_accuracy=0.01):
+        sketch = cls(relative_accuracy)
+        sketch.zero_count = int(zero_count)
+        sketch.offset = int(offset)
+        sketch.bins = np.frombuffer(bins, dtype="<i8").astype(np.int64)
+        return sketch
+
+    def _extend(self, low, high):
+        """Grow the bucket array so it covers keys low..high"""
+        if not self.bins.size:
+            self.offset = low
+            self.bins = np.zeros(high - low + 1, dtype=np.int64)
+            return
+        new_low = min(low, self.offset)
+        new_high = max(high, self.offset + len(self.bins) - 1)
+        if new_low != self.offset or new_high - new_low + 1 != len(self.bins):
+            bins = np.zeros(new_high - new_low + 1, dtype=np.int64)
+            start = self.offset - new_low
+            bins[start:start + len(self.bins)] = self.bins
+            self.offset, self.bins = new_low, bins
+
+    def _key(self, values):
+        return np.ceil(np.log(values) / self.log_gamma).astype(np.int64)
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        positive = values[values > self.MIN_VALUE]
+        self.zero_count += len(values) - len(positive)
+        if positive.size:
+            keys = self._key(positive)
+            self._extend(int(keys.min()), int(keys.max()))
+            self.bins += np.bincount(keys - self.offset, minlength=len(self.bins))
+        return self
+
+    def merge(self, other):
+        self.zero_count += other.zero_count
+        if other.bins.size:
+            self._extend(other.offset, other.offset + len(other.bins) - 1)
+            start = other.offset - self.offset
+            self.bins[start:start + len(other.bins)] += other.bins
+        return self
+
+    def quantile(self, q):
+        """Approximate q-quantile (0-1) within relative_accuracy"""
+        n = self.count
+        if n == 0:
+            return np.nan
+        rank = q * (n - 1)
+        if rank < self.zero_count:
+            return 0.0
+        cumulative = self.zero_count + np.cumsum(self.bins)
+        idx = min(int(np.searchsorted(cumulative, rank, side="right")), len(self.bins) - 1)
+        return float(2 * self.gamma ** (self.offset + idx) / (self.gamma + 1))
+
+    def count_above(self, value):
+        """Approximate number of values greater than value"""
+        if value <= self.MIN_VALUE:
+            return self.count - self.zero_count
+        start = max(int(self._key(np.array([value]))[0]) - self.offset + 1, 0)
+        return int(self.bins[start:].sum())
+
+
+class FlowQuantileIndex:
+    """Quantile sketches kept per station id and calendar month"""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.sketches = {}  # (station id, month index) -> FlowQuantileSketch
+
+    def clear(self):
+        self.sketches = {}
+
+    @staticmethod
+    def month_index(day):
+        return day.year * 12 + day.month - 1
+
+    def add(self, df):
+        """Fold StationId/Date/Flow rows into the monthly sketches"""
+        months = df["Date"].dt.year * 12 + df["Date"].dt.month - 1
+        for (station_id, month), flows in df["Flow"].groupby([df["StationId"], months]):
+            key = (int(station_id), int(month))
+            if key not in self.sketches:
+                self.sketches[key] = FlowQuantileSketch(self.relative_accuracy)
+            self.sketches[key].add(flows.to_numpy())
+
+    @staticmethod
+    def month_span(start_date, end_date):
+        """Split a date range into whole months and partial edge windows
+
+        Returns (first, last, windows): months first..last lie entirely in
+        the range, windows are (start, end) date pairs of the partial edge
+        months that have to be read from raw data.
+        """
+        first, last = FlowQuantileIndex.month_index(start_date), FlowQuantileIndex.month_index(end_date)
+        windows = []
+        if start_date.day != 1:
+            month_end = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+            windows.append((start_date, min(end_date, month_end)))
+            first += 1
+        if (end_date + timedelta(days=1)).day != 1 and last >= first:
+            windows.append((end_date.replace(day=1), end_date))
+            last -= 1
+        return first, last, windows
+
+    def merged(self, station_id, first, last):
+        """Merge the sketches of months first..last; months without a sketch have no data"""
+        sketch = FlowQuantileSketch(self.relative_accuracy)
+        for month in range(first, last + 1):
+            stored = self.sketches.get((station_id, month))
+            if stored is not None:
+                sketch.merge(stored)
+        return sketch
+
+
+class FlowAnimation:
+    """Single station layer animated by the QGIS temporal controller
+
+    Values are kept in a precomputed stations x days array; each frame only
+    rewrites one attribute column of the memory layer instead of building
+    a new layer per day.
+    """
+
+    def __init__(self, stations, latitudes, longitudes, dates, values, layer_name):
+        self.stations = stations
+        self.dates = dates  # pandas DatetimeIndex, one entry per array column
+        self.values = values  # shape: (len(stations), len(dates))
+        self.layer = QgsVectorLayer("Point?crs=EPSG:4326", layer_name, "memory")
+        self.controller = None
+
+        provider = self.layer.dataProvider()
+        provider.addAttributes([
+            QgsField(name="Station", type=QVariant.String, len=0, prec=0, comment='', typeName='text'),
+            QgsField(name="Value", type=QVariant.Double, len=0, prec=0, comment='', typeName='double precision')
+        ])
+        self.layer.updateFields()
+        self.value_idx = self.layer.fields().indexOf("Value")
+
+        features = []
+        for station, lat, lon in zip(stations, latitudes, longitudes):
+            feat = QgsFeature(self.layer.fields())
+            feat.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(float(lon), float(lat))))
+            feat.setAttributes([station, None])
+            features.append(feat)
+        _, added = provider.addFeatures(features)
+        self.fids = [feat.id() for feat in added]
+        self.layer.updateExtents()
+
+        # Katmanın zaman aralığı kontrolcünün kapsamını belirler
+        temporal = self.layer.temporalProperties()
+        temporal.setIsActive(True)
+        temporal.setMode(QgsVectorLayerTemporalProperties.ModeFixedTemporalRange)
+        temporal.setFixedTemporalRange(self.date_range())
+
+    def date_range(self):
+        begin, end = self.dates[0], self.dates[-1] + pd.Timedelta(days=1)
+        return QgsDateTimeRange(QtCore.QDateTime(QtCore.QDate(begin.year, begin.month, begin.day)),
+                                QtCore.QDateTime(QtCore.QDate(end.year, end.month, end.day)))
+
+    def style(self, diverging):
+        """Drive symbol size and colour from the per-frame Value attribute"""
+        finite = np.abs(self.values[np.isfinite(self.values)])
+        vmax = float(finite.max()) if finite.size and finite.max() > 0 else 1.0
+        if diverging:
+            color_expr = f'ramp_color(\'RdBu\', coalesce(scale_linear("Value", {-vmax}, {vmax}, 0, 1), 0.5))'
+        else:
+            color_expr = f'ramp_color(\'Blues\', coalesce(scale_linear("Value", 0, {vmax}, 0.2, 1), 0))'
+        size_expr = f'coalesce(scale_linear(abs("Value"), 0, {vmax}, 2, 10), 1)'
+
+        symbol = QgsMarkerSymbol.createSimple({'name': 'circle', 'color': 'blue', 'size': '3.0'})
+        symbol.setDataDefinedSize(QgsProperty.fromExpression(size_expr))
+        symbol.symbolLayer(0).setDataDefinedProperty(QgsSymbolLayer.PropertyFillColor,
+                                                     QgsProperty.fromExpression(color_expr))
+        self.layer.renderer().setSymbol(symbol)
+
+    def attach(self, controller):
+        """Bind to the temporal controller and set its extent to the data range"""
+        self.controller = controller
+        controller.setTemporalExtents(self.date_range())
+        controller.setFrameDuration(QgsInterval(1, QgsUnitTypes.TemporalDays))
+        controller.setNavigationMode(QgsTemporalNavigationObject.Animated)
+        controller.updateTemporalRange.connect(self.update_frame)
+        # Katman projeden kaldırılınca silinmiş nesneye yazılmasın
+        self.layer.willBeDeleted.connect(self.detach)
+        self.show_day(0)
+
+    def detach(self):
+        if self.controller is not None:
+            try:
+                self.controller.updateTemporalRange.disconnect(self.update_frame)
+            except TypeError:
+                pass
+            self.controller = None
+
+    def update_frame(self, temporal_range):
+        # Zaman kontrolcüsü kapatıldığında boş/sonsuz aralık gelir
+        if not temporal_range.begin().isValid():
+            return
+        begin = temporal_range.begin().date().toPyDate()
+        self.show_day((pd.Timestamp(begin) - self.dates[0]).days)
+
+    def show_day(self, day_idx):
+        """Write column day_idx of the array into the layer's Value field"""
+        day_idx = min(max(day_idx, 0), len(self.dates) - 1)
+        column = self.values[:, day_idx]
+        changes = {fid: {self.value_idx: float(v) if np.isfinite(v) else None}
+                   for fid, v in zip(self.fids, column)}
+        self.layer.dataProvider().changeAttributeValues(changes)
+        self.layer.triggerRepaint()
+
+
+class CanvasUpdateBatch:
+    """Collect layer additions and extent changes into a single canvas refresh
+
+    Used as a (nestable) context manager: rendering is frozen on the first
+    enter and the queued layers, extent and refresh are applied once on the
+    outermost exit. Outside a block every change is applied immediately.
+    """
+
+    ZOOM_BUFFER = 0.1  # derece
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.depth = 0
+        self.layers = []
+        self.bounds = None  # [xmin, ymin, xmax, ymax]
+        self.extent = None
+
+    def __enter__(self):
+        if self.depth == 0:
+            self.canvas.freeze(True)
+        self.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.depth -= 1
+        if self.depth == 0:
+            self.flush()
+        return False
+
+    def add_layer(self, layer):
+        self.layers.append(layer)
+        if self.depth == 0:
+            self.flush()
+
+    def include_points(self, longitudes, latitudes):
+        """Grow the pending extent to cover the given coordinate arrays"""
+        longitudes = np.asarray(longitudes, dtype=float)
+        latitudes = np.asarray(latitudes, dtype=float)
+        valid = np.isfinite(longitudes) & np.isfinite(latitudes)
+        if not valid.any():
+            return
+        bounds = [longitudes[valid].min(), latitudes[valid].min(),
+                  longitudes[valid].max(), latitudes[valid].max()]
+        if self.bounds is None:
+            self.bounds = bounds
+        else:
+            self.bounds = [min(self.bounds[0], bounds[0]), min(self.bounds[1], bounds[1]),
+                           max(self.bounds[2], bounds[2]), max(self.bounds[3], bounds[3])]
+        if self.depth == 0:
+            self.flush()
+
+    def zoom_to_point(self, longitude, latitude):
+        """Request an extent buffered around a single point; overrides include_points"""
+        b = self.ZOOM_BUFFER
+        self.extent = QgsRectangle(longitude - b, latitude - b, longitude + b, latitude + b)
+        if self.depth == 0:
+            self.flush()
+
+    def flush(self):
+        try:
+            if self.layers:
+                QgsProject.instance().addMapLayers(self.layers)
+
+            extent = self.extent
+            if extent is None and self.bounds is not None:
+                xmin, ymin, xmax, ymax = self.bounds
+                if xmax - xmin == 0 or ymax - ymin == 0:
+                    # Tek nokta veya aynı hizadaki noktalar için tampon kullan
+                    xmin, ymin = xmin - self.ZOOM_BUFFER, ymin - self.ZOOM_BUFFER
+                    xmax, ymax = xmax + self.ZOOM_BUFFER, ymax + self.ZOOM_BUFFER
+                extent = QgsRectangle(float(xmin), float(ymin), float(xmax), float(ymax))
+            if extent is not None:
+                self.canvas.setExtent(extent)
+        finally:
+            self.layers, self.bounds, self.extent = [], None, None
+            self.canvas.freeze(False)
+            self.canvas.refresh()
+
+
 class RiverFlowAnalyzer:
+    # Analizlerin SQL'e aktarılabilen toplulaştırmaları: (fonksiyon, periyot)
+    SQL_AGGREGATES = {
+        "avgflow": ("mean", None),
+        "count": ("count", None),
+        "sumflow": ("sum", "year"),
+        "monthly_avg": ("mean", "month"),
+    }
+
     def __init__(self, iface):
         self.iface = iface
         self.plugin_dir = os.path.dirname(__file__)  # Eklenti dizinini al
         self.canvas = iface.mapCanvas()
-        self.station_locations = {}
+        self.canvas_updates = CanvasUpdateBatch(self.canvas)
+        self.station_registry = StationRegistry()
+        self.flow_sketches = FlowQuantileIndex()
+        self.dataframes = []
+        self.store = FlowTimeSeriesStore(os.path.join(self.plugin_dir, "layers", "flow_series.sqlite"))
+        self.animation = None
         self.dialog = None
 
     def run(self):
@@ -50,6 +696,11 @@ class RiverFlowAnalyzer:
         self.select_button.clicked.connect(self.load_csv_files)
         analysis_layout.addWidget(self.select_button)
 
+        # Optional on-disk time-series backend
+        self.store_checkbox = QCheckBox("Veritabanı Kullan (layers/flow_series.sqlite)")
+        self.store_checkbox.toggled.connect(self.toggle_store)
+        analysis_layout.addWidget(self.store_checkbox)
+
         self.station_list = QListWidget()
         self.station_list.setSelectionMode(QListWidget.MultiSelection)
         analysis_layout.addWidget(self.station_list)
@@ -91,6 +742,16 @@ class RiverFlowAnalyzer:
         self.zoom_checkbox = QCheckBox("Seçilen İstasyona Zoom Yap")
         analysis_layout.addWidget(self.zoom_checkbox)
 
+        # Temporal animation
+        self.animation_layout = QHBoxLayout()
+        self.animation_combo = QComboBox()
+        self.animation_combo.addItems(["Günlük Akım", "Aylık Ortalamaya Göre Anomali"])
+        self.animation_layout.addWidget(self.animation_combo)
+        self.animation_button = QPushButton("Akım Animasyonu Oluştur")
+        self.animation_button.clicked.connect(self.create_animation)
+        self.animation_layout.addWidget(self.animation_button)
+        analysis_layout.addLayout(self.animation_layout)
+
         # Analysis buttons
         buttons = [
             ("Trend Analizi", "trend"),
@@ -200,7 +861,8 @@ class RiverFlowAnalyzer:
         self.files, _ = QFileDialog.getOpenFileNames(None, "CSV Dosyalarını Seç", "", "CSV files (*.csv)")
         self.dataframes = []
         self.station_list.clear()
-        self.station_locations = {}
+        self.station_registry.clear()
+        self.flow_sketches.clear()
 
         for file in self.files:
             try:
@@ -214,23 +876,100 @@ class RiverFlowAnalyzer:
                     "Boylam": "Longitude"
                 })
                 df["Date"] = pd.to_datetime(df["Date"], dayfirst=True, errors='coerce')
-                df = df.dropna(subset=["Date"])
-
-                # Store station locations
-                for station, group in df.groupby("Station"):
-                    if station not in self.station_locations:
-                        self.station_locations[station] = {
-                            'Latitude': group['Latitude'].iloc[0],
-                            'Longitude': group['Longitude'].iloc[0]
-                        }
+                df = df.dropna(subset=["Date", "Station"])
+
+                # Register stations; flow rows keep only the integer station id
+                station_ids = self.station_registry.register(df)
+                if self.store_checkbox.isChecked():
+                    self.store.append(df)
+                stations = df["Station"].unique()
+                df = pd.DataFrame({"StationId": station_ids, "Date": df["Date"], "Flow": df["Flow"]})
+                self.flow_sketches.add(df)
 
                 self.dataframes.append(df)
-                for station in df["Station"].unique():
+                for station in stations:
                     if not self.station_list.findItems(station, QtCore.Qt.MatchExactly):
                         self.station_list.addItem(station)
             except Exception as e:
                 QMessageBox.warning(None, "Hata", f"{file} dosyası yüklenirken hata oluştu: {e}")
 
+    def toggle_store(self, checked):
+        """Sync loaded CSVs into the time-series store and load its station list"""
+        if not checked:
+            return
+        try:
+            # Kutu işaretlenmeden önce yüklenen veriler de veritabanına yazılır
+            for df in self.dataframes:
+                self.store.append(self.station_registry.expand(df))
+            locations = self.store.locations()
+            self.station_registry.add_many(list(locations),
+                                           [loc["Latitude"] for loc in locations.values()],
+                                           [loc["Longitude"] for loc in locations.values()])
+            for station in locations:
+                if not self.station_list.findItems(station, QtCore.Qt.MatchExactly):
+                    self.station_list.addItem(station)
+            self.store.add_to_project("Akım İstasyonları")
+        except Exception as e:
+            QMessageBox.warning(None, "Hata", f"Veritabanı açılırken hata oluştu: {e}")
+
+    def load_filtered_data(self, stations, start_date, end_date):
+        """Return raw rows for the given stations and date range"""
+        if self.store_checkbox.isChecked():
+            return self.store.query(stations, start_date, end_date)
+        all_df = pd.concat(self.dataframes, ignore_index=True)
+        station_ids = self.station_registry.ids_for(stations)
+        filtered_df = all_df[(all_df["StationId"].isin(station_ids)) &
+                             (all_df["Date"] >= pd.to_datetime(start_date)) &
+                             (all_df["Date"] <= pd.to_datetime(end_date))]
+        return self.station_registry.expand(filtered_df)
+
+    def window_rows(self, stations, windows):
+        """Return in-memory raw rows of the stations inside the date windows
+
+        Each loaded frame is masked on its own, so the full data set is
+        never concatenated.
+        """
+        station_ids = self.station_registry.ids_for(stations)
+        parts = []
+        for df in self.dataframes:
+            in_windows = np.zeros(len(df), dtype=bool)
+            for window_start, window_end in windows:
+                in_windows |= ((df["Date"] >= pd.Timestamp(window_start)) &
+                               (df["Date"] <= pd.Timestamp(window_end))).to_numpy()
+            mask = in_windows & df["StationId"].isin(station_ids).to_numpy()
+            if mask.any():
+                parts.append(df[mask])
+        if not parts:
+            return pd.DataFrame(columns=["Station", "Date", "Flow", "Latitude", "Longitude"])
+        return self.station_registry.expand(pd.concat(parts, ignore_index=True))
+
+    def flow_sketches_for(self, stations, start_date, end_date):
+        """Quantile sketches of each station's flows in the date range
+
+        Whole months come from the monthly sketches (a month without a
+        sketch has no data); only the partial edge months are read from
+        raw rows. With the store enabled its sketch table is used, since it
+        also covers data from earlier sessions.
+        """
+        first, last, windows = FlowQuantileIndex.month_span(start_date, end_date)
+        store_enabled = self.store_checkbox.isChecked()
+        if store_enabled:
+            sketches = self.store.merged_sketches(stations, first, last)
+        else:
+            sketches = {station: self.flow_sketches.merged(self.station_registry.index.get(station, -1), first, last)
+                        for station in stations}
+
+        # Yalnızca kısmi kenar ayları ham veriden okunur
+        if windows:
+            if store_enabled:
+                rows = pd.concat([self.store.query(stations, window_start, window_end)
+                                  for window_start, window_end in windows], ignore_index=True)
+            else:
+                rows = self.window_rows(stations, windows)
+            for station, group in rows.groupby("Station"):
+                sketches[station].add(group["Flow"].to_numpy())
+        return sketches
+
     def perform_analysis(self, analysis_type):
         selected_stations = [item.text() for item in self.station_list.selectedItems()]
         if not selected_stations:
@@ -240,11 +979,6 @@ class RiverFlowAnalyzer:
         start_date = self.start_date.date().toPyDate()
         end_date = self.end_date.date().toPyDate()
 
-        all_df = pd.concat(self.dataframes, ignore_index=True)
-        filtered_df = all_df[(all_df["Station"].isin(selected_stations)) &
-                             (all_df["Date"] >= pd.to_datetime(start_date)) &
-                             (all_df["Date"] <= pd.to_datetime(end_date))]
-
         result_df = pd.DataFrame()
         results = []  # Results will be collected here
 
@@ -253,6 +987,18 @@ class RiverFlowAnalyzer:
         self.progress.setRange(0, len(selected_stations))
 
         try:
+            sql_agg = None
+            if self.store_checkbox.isChecked() and analysis_type in self.SQL_AGGREGATES:
+                # Basit toplulaştırmalar SQL tarafında yapılır
+                func, period = self.SQL_AGGREGATES[analysis_type]
+                sql_agg = self.store.aggregate(selected_stations, start_date, end_date, func, period)
+                filtered_df = None
+            elif analysis_type == "flood":
+                # Eşikler aylık quantile sketch'lerinden hesaplanır
+                filtered_df = None
+            else:
+                filtered_df = self.load_filtered_data(selected_stations, start_date, end_date)
+
             if analysis_type == "trend":
                 fig, ax = plt.subplots(figsize=(12, 6))
                 for i, station in enumerate(selected_stations):
@@ -285,9 +1031,12 @@ class RiverFlowAnalyzer:
                     self.progress.setValue(i)
                     QtCore.QCoreApplication.processEvents()
 
-                    station_df = filtered_df[filtered_df["Station"] == station].copy()
-                    station_df["Year"] = station_df["Date"].dt.year
-                    yearly_sum = station_df.groupby("Year")["Flow"].sum().reset_index()
+                    if sql_agg is not None:
+                        yearly_sum = sql_agg[sql_agg["Station"] == station][["Year", "Flow"]].reset_index(drop=True)
+                    else:
+                        station_df = filtered_df[filtered_df["Station"] == station].copy()
+                        station_df["Year"] = station_df["Date"].dt.year
+                        yearly_sum = station_df.groupby("Year")["Flow"].sum().reset_index()
                     yearly_sum["Station"] = station
 
                     # Collect results
@@ -351,9 +1100,12 @@ class RiverFlowAnalyzer:
                 for i, station in enumerate(selected_stations):
                     self.progress.setValue(i)
                     QtCore.QCoreApplication.processEvents()
-                    station_df = filtered_df[filtered_df["Station"] == station].copy()
-                    station_df["Month"] = station_df["Date"].dt.month.astype(int)
-                    monthly_avg = station_df.groupby("Month")["Flow"].mean().reset_index()
+                    if sql_agg is not None:
+                        monthly_avg = sql_agg[sql_agg["Station"] == station][["Month", "Flow"]]
+                    else:
+                        station_df = filtered_df[filtered_df["Station"] == station].copy()
+                        station_df["Month"] = station_df["Date"].dt.month.astype(int)
+                        monthly_avg = station_df.groupby("Month")["Flow"].mean().reset_index()
                     # Eksik ayları tamamla
                     all_months = pd.DataFrame({'Month': range(1, 13)})
                     monthly_avg = pd.merge(all_months, monthly_avg, on='Month', how='left')
@@ -423,17 +1175,18 @@ class RiverFlowAnalyzer:
                 result_df = pd.DataFrame(results)
 
             elif analysis_type == "flood":
+                sketches = self.flow_sketches_for(selected_stations, start_date, end_date)
                 for i, station in enumerate(selected_stations):
                     self.progress.setValue(i)
                     QtCore.QCoreApplication.processEvents()
 
-                    station_df = filtered_df[filtered_df["Station"] == station].copy()
-                    if station_df.empty:
+                    sketch = sketches[station]
+                    if sketch.count == 0:
                         continue
 
-                    threshold = station_df["Flow"].quantile(0.9)
-                    flood_days = station_df[station_df["Flow"] > threshold].shape[0]
-                    total_days = station_df.shape[0]
+                    threshold = sketch.quantile(0.9)
+                    flood_days = sketch.count_above(threshold)
+                    total_days = sketch.count
                     flood_ratio = flood_days / total_days if total_days > 0 else 0
 
                     results.append({
@@ -483,6 +1236,13 @@ class RiverFlowAnalyzer:
                     self.progress.setValue(i)
                     QtCore.QCoreApplication.processEvents()
 
+                    if sql_agg is not None:
+                        station_agg = sql_agg[sql_agg["Station"] == station]
+                        if not station_agg.empty:
+                            column = "Average Flow" if analysis_type == "avgflow" else "Count"
+                            results.append({"Station": station, column: station_agg["Flow"].iloc[0]})
+                        continue
+
                     station_df = filtered_df[filtered_df["Station"] == station].copy()
                     if station_df.empty:
                         continue
@@ -511,29 +1271,31 @@ class RiverFlowAnalyzer:
                 result_text = result_df.to_string(index=False)
                 QMessageBox.information(None, f"{analysis_type.capitalize()} Analizi", result_text)
 
-            # Export results
-            if self.export_checkbox.isChecked() and not result_df.empty:
-                out_path = os.path.expanduser("~/Desktop")
-                ext = self.export_format_combo.currentText().lower()
+            # Katman eklemeleri ve kapsam değişiklikleri tek seferde uygulanır
+            with self.canvas_updates:
+                # Export results
+                if self.export_checkbox.isChecked() and not result_df.empty:
+                    out_path = os.path.expanduser("~/Desktop")
+                    ext = self.export_format_combo.currentText().lower()
 
-                if ext in ["shapefile", "geopackage"]:
-                    self.export_as_vector(result_df, analysis_type, start_date, end_date, ext)
-                else:
-                    out_file = os.path.join(out_path,
-                                            f"nehir_akis_{analysis_type}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.{ext if ext != 'excel' else 'xlsx'}")
-                    if ext == "csv":
-                        result_df.to_csv(out_file, index=False, encoding="utf-8-sig")
+                    if ext in ["shapefile", "geopackage"]:
+                        self.export_as_vector(result_df, analysis_type, start_date, end_date, ext)
                     else:
-                        result_df.to_excel(out_file, index=False)
-                    QMessageBox.information(None, "Başarılı", f"Sonuçlar başarıyla kaydedildi:\n{out_file}")
-
-            # Show on map
-            if self.map_checkbox.isChecked() and not result_df.empty:
-                self.show_on_map(result_df, analysis_type)
-
-                # Zoom to selected station
-                if self.zoom_checkbox.isChecked() and len(selected_stations) == 1:
-                    self.zoom_to_station(selected_stations[0])
+                        out_file = os.path.join(out_path,
+                                                f"nehir_akis_{analysis_type}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.{ext if ext != 'excel' else 'xlsx'}")
+                        if ext == "csv":
+                            result_df.to_csv(out_file, index=False, encoding="utf-8-sig")
+                        else:
+                            result_df.to_excel(out_file, index=False)
+                        QMessageBox.information(None, "Başarılı", f"Sonuçlar başarıyla kaydedildi:\n{out_file}")
+
+                # Show on map
+                if self.map_checkbox.isChecked() and not result_df.empty:
+                    self.show_on_map(result_df, analysis_type)
+
+                    # Zoom to selected station
+                    if self.zoom_checkbox.isChecked() and len(selected_stations) == 1:
+                        self.zoom_to_station(selected_stations[0])
 
         except Exception as e:
             QMessageBox.critical(None, "Hata", f"Analiz sırasında hata oluştu: {str(e)}")
@@ -574,7 +1336,7 @@ class RiverFlowAnalyzer:
             QMessageBox.information(None, "Başarılı", f"Vektör katmanı başarıyla kaydedildi:\n{out_file}")
             # Add layer to QGIS
             saved_layer = QgsVectorLayer(out_file, layer_name, "ogr")
-            QgsProject.instance().addMapLayer(saved_layer)
+            self.canvas_updates.add_layer(saved_layer)
         else:
             QMessageBox.warning(None, "Hata", f"Vektör katmanı kaydedilemedi: {error}")
 
@@ -582,12 +1344,12 @@ class RiverFlowAnalyzer:
         """Create a point vector layer from analysis results"""
         # Check if we have location data
         if "Latitude" not in result_df.columns or "Longitude" not in result_df.columns:
-            # Try to add from stored locations
-            for idx, row in result_df.iterrows():
-                station = row["Station"]
-                if station in self.station_locations:
-                    result_df.at[idx, "Latitude"] = self.station_locations[station]["Latitude"]
-                    result_df.at[idx, "Longitude"] = self.station_locations[station]["Longitude"]
+            # Try to add from the station registry
+            station_ids = self.station_registry.ids_for(result_df["Station"].tolist())
+            if (station_ids >= 0).any():
+                latitudes, longitudes = self.station_registry.coordinates(station_ids)
+                result_df["Latitude"] = latitudes
+                result_df["Longitude"] = longitudes
 
         if "Latitude" not in result_df.columns or "Longitude" not in result_df.columns:
             return None
@@ -660,37 +1422,71 @@ class RiverFlowAnalyzer:
         })
         vl.renderer().setSymbol(symbol)
 
-        # Add layer to QGIS
-        QgsProject.instance().addMapLayer(vl)
-
-        # Zoom to layer extent
-        self.canvas.setExtent(vl.extent())
-        self.canvas.refresh()
+        # Add layer to QGIS and zoom to the station coordinates
+        self.canvas_updates.add_layer(vl)
+        self.canvas_updates.include_points(result_df["Longitude"], result_df["Latitude"])
 
     def zoom_to_station(self, station_name):
         """Zoom to a specific station on the map"""
-        if station_name in self.station_locations:
-            loc = self.station_locations[station_name]
-            point = QgsPointXY(float(loc["Longitude"]), float(loc["Latitude"]))
-
-            # Create point geometry and buffer it
-            geom = QgsGeometry.fromPointXY(point)
-            buffered_geom = geom.buffer(0.1, 5)  # 0.1 derece buffer
-
-            # Set extent to buffered geometry
-            self.canvas.setExtent(buffered_geom.boundingBox())
-            self.canvas.refresh()
+        if station_name in self.station_registry:
+            station_id = self.station_registry.index[station_name]
+            with self.canvas_updates:
+                self.canvas_updates.zoom_to_point(float(self.station_registry.longitudes[station_id]),
+                                                  float(self.station_registry.latitudes[station_id]))
         else:
             QMessageBox.warning(None, "Uyarı", f"{station_name} istasyonunun konum bilgisi bulunamadı.")
 
+    def create_animation(self):
+        """Build a time-enabled station layer driven by the temporal controller"""
+        selected_stations = [item.text() for item in self.station_list.selectedItems()]
+        if not selected_stations:
+            QMessageBox.warning(None, "Uyarı", "Lütfen en az bir istasyon seçin.")
+            return
+
+        start_date = self.start_date.date().toPyDate()
+        end_date = self.end_date.date().toPyDate()
+        anomaly = self.animation_combo.currentIndex() == 1
+
+        try:
+            filtered_df = self.load_filtered_data(selected_stations, start_date, end_date)
+            stations = [s for s in selected_stations
+                        if s in self.station_registry and (filtered_df["Station"] == s).any()]
+            if not stations:
+                QMessageBox.warning(None, "Uyarı", "Seçilen istasyonlar için veri veya konum bilgisi bulunamadı.")
+                return
+
+            # İstasyon x gün dizisi
+            dates = pd.date_range(start_date, end_date, freq="D")
+            flows = (filtered_df.pivot_table(index="Station", columns="Date", values="Flow", aggfunc="mean")
+                     .reindex(index=stations, columns=dates))
+            values = flows.to_numpy(dtype=float)
+
+            if anomaly:
+                # monthly_avg analizindeki aylık ortalamalardan sapma
+                monthly_avg = (filtered_df.groupby(["Station", filtered_df["Date"].dt.month])["Flow"].mean()
+                               .unstack().reindex(index=stations, columns=range(1, 13)).to_numpy(dtype=float))
+                values = values - monthly_avg[:, dates.month - 1]
+
+            if self.animation is not None:
+                self.animation.detach()
+            layer_name = "RiverFlow_Anomali" if anomaly else "RiverFlow_Animasyon"
+            latitudes, longitudes = self.station_registry.coordinates(self.station_registry.ids_for(stations))
+            self.animation = FlowAnimation(stations, latitudes, longitudes, dates, values, layer_name)
+            self.animation.style(diverging=anomaly)
+            QgsProject.instance().addMapLayer(self.animation.layer)
+            self.animation.attach(self.canvas.temporalController())
+        except Exception as e:
+            QMessageBox.critical(None, "Hata", f"Animasyon oluşturulurken hata oluştu: {str(e)}")
+
     def perform_all_analyses(self):
         plt.ioff()
         analysis_types = [
             "trend", "maxflow", "avgflow", "stddev", "minflow", "count", "sumflow",
             "season", "monthly_avg", "mann_kendall", "flood", "dry"
         ]
-        for analysis_type in analysis_types:
-            self.perform_analysis(analysis_type)
+        with self.canvas_updates:
+            for analysis_type in analysis_types:
+                self.perform_analysis(analysis_type)
         plt.ion()
 
     def initGui(self):